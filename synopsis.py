@@ -3,8 +3,15 @@
 import os
 import sys
 import argparse
+import bisect
+import functools
+import hashlib
+import pickle
 import platform
+import queue
 import subprocess
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import Dict, Optional, Set
 
@@ -15,7 +22,37 @@ except ImportError:
     print("On Windows, there's some ways to go about installing it, but it's not there by default.")
     sys.exit(1)
 
+# Entirely optional: on Linux, a liburing install lets us batch all the file
+# reads into a couple of syscalls. Everything works fine without it.
+try:
+    import liburing
+    _HAS_LIBURING = sys.platform == "linux"
+except ImportError:
+    _HAS_LIBURING = False
+
 selected_files: Set[str] = set()
+selected_sorted: list = [] # sorted copy of selected_files, for prefix queries
+
+# Directories that are never worth offering in the selector - descending into
+# .git or node_modules easily costs 10x more stat calls than the whole rest of
+# the project.
+PRUNE_DIRS: Set[str] = {
+    ".git", "node_modules", ".venv", "venv", "__pycache__", ".mypy_cache",
+    ".pytest_cache", "target", "dist", "build",
+}
+
+_ICON_MAP: Dict[str, str] = {
+    "py": "🐍 ",
+    "rs": "🦀 ",
+    "md": "📝 ",
+    "txt": "📝 ",
+    "sh": "🐚 ",
+    "java": "☕️ ",
+}
+_DEFAULT_ICON = "📄 "
+
+# indentation strings by depth, so rendering never rebuilds them
+_INDENTS = tuple("    " * depth for depth in range(128))
 
 # ----------------------- build a copy of the filesystem -----------------------
 
@@ -30,6 +67,18 @@ class Node:
         self.path = path
         self.parent = parent
         self.selected = path in selected_files
+        self._display = None # cached icon + name, built on first render
+        self._ext = name.rpartition('.')[2] if '.' in name else ''
+
+def any_selected_under(path: str) -> bool:
+    # Does any selected file live somewhere below this directory? Bisecting
+    # into the sorted path list finds the first candidate in O(log n); if even
+    # that one doesn't share the prefix, nothing below does.
+    if not path:
+        return len(selected_sorted) > 0
+    prefix = path + os.sep
+    i = bisect.bisect_left(selected_sorted, prefix)
+    return i < len(selected_sorted) and selected_sorted[i].startswith(prefix)
 
 class Dir(Node):
     expanded: bool
@@ -37,46 +86,295 @@ class Dir(Node):
     def __init__(self, name, path, parent):
         super().__init__(name, path, parent)
 
+        # Children are scanned lazily on first expansion, so collapsed
+        # subtrees cost nothing and startup no longer walks the whole tree.
+        self.children = None
+
+        self.expanded = any_selected_under(path)
+        self.selected = False
+        self.partial = self.expanded # refined to (some but not all) on scan
+
+        # How many selectable files live below here, and how many of them are
+        # selected. An unscanned subdirectory counts as one unselected pseudo-
+        # leaf until its scan corrects the ancestors.
+        self._leaf_count = 0
+        self._selected_count = 0
+
+    def _derive_flags(self):
+        self.selected = self._leaf_count > 0 and self._selected_count == self._leaf_count
+        self.partial = 0 < self._selected_count < self._leaf_count
+
+    def refresh_flags(self):
+        # Recompute the counts from direct children (whose own counts must
+        # already be current), then the selected/partial flags from those.
+        if self.children is None:
+            return
+        leaves = 0
+        sel = 0
+        for child in self.children:
+            if isinstance(child, Dir):
+                if child.children is None:
+                    leaves += 1
+                else:
+                    leaves += child._leaf_count
+                    sel += child._selected_count
+            else:
+                leaves += 1
+                sel += child.selected
+        self._leaf_count = leaves
+        self._selected_count = sel
+        self._derive_flags()
+
+    def ensure_scanned(self, _propagate=True):
+        if self.children is not None:
+            return
         self.children = []
 
-        for child in os.listdir(os.path.join(os.getcwd(), path)):
-            full_path = os.path.join(path, child)
-            if os.path.isdir(full_path):
-                self.children.append(Dir(child, full_path, self))
-            else:
-                self.children.append(Node(child, full_path, self))
+        # scandir gives us the entry type straight from readdir, so we skip a
+        # stat syscall per child compared to listdir + isdir.
+        with os.scandir(os.path.join(os.getcwd(), self.path)) as entries:
+            for entry in entries:
+                if entry.name in PRUNE_DIRS or entry.name.startswith("."):
+                    # ...unless .llm_info already selects it or something
+                    # beneath it - hiding those rows would silently drop
+                    # them from .llm_info on the next save.
+                    hidden = os.path.join(self.path, entry.name)
+                    if hidden not in selected_files and not any_selected_under(hidden):
+                        continue
+                child_path = os.path.join(self.path, entry.name)
+                if entry.is_dir(follow_symlinks=False):
+                    self.children.append(Dir(entry.name, child_path, self))
+                else:
+                    self.children.append(Node(entry.name, child_path, self))
 
         # directories first, then files - each alphabetically
         self.children.sort(key=lambda x: (not isinstance(x, Dir), x.name))
 
-        self.selected = all(child.selected for child in self.children)
-        self.expanded = any(
-            child.selected or (isinstance(child, Dir) and child.expanded)
-            for child in self.children
-        )
-        self.selected = self.selected and len(self.children) > 0
-        self.expanded = self.expanded and len(self.children) > 0
+        # Subdirectories with selections in them are about to be shown anyway,
+        # so scan those now to get their selected flags right. No propagation:
+        # our own refresh_flags below picks their counts up.
+        for child in self.children:
+            if isinstance(child, Dir) and child.expanded:
+                child.ensure_scanned(_propagate=False)
+
+        self.refresh_flags()
+
+        # Scanned ancestors counted this dir as a single unselected pseudo-
+        # leaf - correct them with one O(depth) walk.
+        if _propagate:
+            d_leaf = self._leaf_count - 1
+            d_sel = self._selected_count
+            parent = self.parent
+            while parent is not None and parent.children is not None:
+                parent._leaf_count += d_leaf
+                parent._selected_count += d_sel
+                parent._derive_flags()
+                parent = parent.parent
+
+
+_git_files: Optional[list] = None
+_git_files_fetched = False
+
+def get_git_files() -> Optional[list]:
+    # Tracked paths from a single `git ls-files -z` call, or None outside a
+    # repo. Cached so the tree build and the structure block share one spawn.
+    global _git_files, _git_files_fetched
+    if not _git_files_fetched:
+        _git_files_fetched = True
+        try:
+            result = subprocess.run(
+                ["git", "ls-files", "-z"],
+                capture_output=True, check=True
+            )
+            _git_files = [
+                p for p in result.stdout.decode("utf-8", "replace").split("\0")
+                if p
+            ]
+        except Exception:
+            _git_files = None # not a git repo, or no git here at all
+    return _git_files
+
+def tree_from_git(paths: list) -> Dir:
+    # Build the whole Dir/Node graph from the tracked path list - zero
+    # scandir/stat syscalls, and ignored files never even show up.
+    root = Dir(os.path.basename(directory), "", None)
+    root.children = []
+    dirs = {"": root}
+
+    def get_dir(path: str) -> Dir:
+        node = dirs.get(path)
+        if node is None:
+            parent = get_dir(path.rsplit("/", 1)[0] if "/" in path else "")
+            node = Dir(path.rsplit("/", 1)[-1], path, parent)
+            node.children = []
+            parent.children.append(node)
+            dirs[path] = node
+        return node
+
+    for path in paths:
+        parts = path.split("/")
+        # same visibility rules as the scandir walk: hidden and pruned paths
+        # stay out unless .llm_info already selects them
+        if (
+            path not in selected_files
+            and any(part in PRUNE_DIRS or part.startswith(".") for part in parts)
+        ):
+            continue
+        parent = get_dir(path.rsplit("/", 1)[0] if "/" in path else "")
+        parent.children.append(Node(parts[-1], path, parent))
+
+    # Selected paths git doesn't list (untracked or ignored files) still need
+    # nodes: the save path rewrites .llm_info from the tree's selected leaves,
+    # so leaving them out would erase them on a no-op edit. The filesystem
+    # walk shows these naturally - keep parity with it.
+    tracked = set(paths)
+    for path in selected_files:
+        if path not in tracked and os.path.isfile(os.path.join(directory, path)):
+            parent = get_dir(path.rsplit("/", 1)[0] if "/" in path else "")
+            parent.children.append(Node(path.rsplit("/", 1)[-1], path, parent))
+
+    def finalize(node: Dir) -> None:
+        # directories first, then files - each alphabetically
+        node.children.sort(key=lambda x: (not isinstance(x, Dir), x.name))
+        for child in node.children:
+            if isinstance(child, Dir):
+                finalize(child)
+        node.refresh_flags()
+
+    finalize(root)
+    return root
+
+
+# ------------------------- tree cache between runs ----------------------------
+
+def reattach_selection(root: Dir) -> bool:
+    # A cached tree carries whatever selection it was pickled with, so refresh
+    # every node against the current selected set - children before parents.
+    # Returns False when the selection names paths the tree never materialized
+    # (e.g. newly added under a hidden directory), so callers can rebuild.
+    seen = set()
+    order = []
+    stack = [root]
+    while stack:
+        n = stack.pop()
+        order.append(n)
+        if isinstance(n, Dir) and n.children is not None:
+            stack.extend(n.children)
+    for n in reversed(order):
+        if isinstance(n, Dir):
+            n.expanded = any_selected_under(n.path)
+            if n.children is None:
+                n.selected = False
+                n.partial = n.expanded
+            else:
+                n.refresh_flags()
+            n._display = None
+        else:
+            n.selected = n.path in selected_files
+            seen.add(n.path)
+    return selected_files <= seen
 
+def tree_cache_path() -> Optional[str]:
+    # Key the cache on the git index mtime - any commit, add, or checkout
+    # bumps it, which is exactly when the tracked file set can change.
+    try:
+        fingerprint = os.stat(os.path.join(directory, ".git", "index")).st_mtime_ns
+    except OSError:
+        return None # not a git repo - the lazy walk is cheap enough uncached
+    cwd_hash = hashlib.blake2b(directory.encode(), digest_size=8).hexdigest()
+    cache_dir = os.path.join(
+        os.environ.get("XDG_CACHE_HOME", os.path.expanduser("~/.cache")),
+        "synopsis",
+    )
+    return os.path.join(cache_dir, f"{cwd_hash}-{fingerprint}.pkl")
+
+def load_cached_tree() -> Optional[Dir]:
+    path = tree_cache_path()
+    if path is None:
+        return None
+    try:
+        with open(path, "rb") as f:
+            root = pickle.load(f)
+    except Exception:
+        return None
+    if not reattach_selection(root):
+        return None # a fresh build will materialize the missing paths
+    return root
+
+def save_cached_tree(root: Dir) -> None:
+    path = tree_cache_path()
+    if path is None:
+        return
+    try:
+        cache_dir, name = os.path.split(path)
+        os.makedirs(cache_dir, exist_ok=True)
+        # toss entries for older states of this same working tree
+        prefix = name.split("-")[0] + "-"
+        for old in os.listdir(cache_dir):
+            if old.startswith(prefix) and old != name:
+                os.remove(os.path.join(cache_dir, old))
+        with open(path, "wb") as f:
+            pickle.dump(root, f)
+    except Exception:
+        pass # caching is best-effort
 
 
 # ------------------------ display selector with curses ------------------------
 
+def compute_display(node) -> str:
+    if isinstance(node, Dir):
+        return ("📂 " if node.expanded else "📁 ") + node.name
+    return _ICON_MAP.get(node._ext, _DEFAULT_ICON) + node.name
+
 def get_visible_nodes(node, depth=0):
-    visible = [(node, depth)]
-    # If directory is expanded, recurse on children
-    if isinstance(node, Dir) and node.expanded:
-        for child in node.children:
-            visible.extend(get_visible_nodes(child, depth + 1))
+    visible = []
+    stack = [(node, depth)]
+    while stack:
+        node, depth = stack.pop()
+        visible.append((node, depth))
+        # expanded directories contribute their children, in order
+        if isinstance(node, Dir) and node.expanded:
+            node.ensure_scanned()
+            stack.extend((child, depth + 1) for child in reversed(node.children))
     return visible
 
 def invert(node, direction=None):
-    if direction is not None:
-        node.selected = direction
-    else:
-        node.selected = not node.selected
+    if direction is None:
+        direction = not node.selected
+
+    # Scan everything below first, with ancestor propagation, so every leaf
+    # count is final before we snapshot and flip. Scanning mid-flip would
+    # push pre-flip placeholder corrections into ancestors whose counts were
+    # already rewritten, leaving the rollups corrupted.
     if isinstance(node, Dir):
-        for child in node.children:
-            invert(child, node.selected)
+        stack = [node]
+        while stack:
+            n = stack.pop()
+            n.ensure_scanned()
+            stack.extend(c for c in n.children if isinstance(c, Dir))
+
+    before = node._selected_count if isinstance(node, Dir) else int(node.selected)
+
+    # flip the subtree to one uniform state
+    stack = [node]
+    while stack:
+        n = stack.pop()
+        if isinstance(n, Dir):
+            n._selected_count = n._leaf_count if direction else 0
+            n._derive_flags()
+            stack.extend(n.children)
+        else:
+            n.selected = direction
+
+    after = node._selected_count if isinstance(node, Dir) else int(direction)
+
+    # a single O(depth) arithmetic walk keeps every ancestor's rollup honest
+    delta = after - before
+    parent = node.parent
+    while parent is not None and parent.children is not None:
+        parent._selected_count += delta
+        parent._derive_flags()
+        parent = parent.parent
 
 def interactive_selector(stdscr, root) -> Set[str]:
 
@@ -86,85 +384,129 @@ def interactive_selector(stdscr, root) -> Set[str]:
     curses.use_default_colors()
     curses.init_pair(1, curses.COLOR_GREEN, -1)  # selected
     curses.init_pair(2, curses.COLOR_RED, -1)    # not selected
+    curses.init_pair(3, curses.COLOR_YELLOW, -1) # partially selected dir
 
     current_index = 0
     window_pos = 0
 
+    # The flattened list of visible rows only changes when a directory is
+    # expanded or collapsed - cache it so plain navigation doesn't re-walk the
+    # tree every keypress. node_index maps id(node) -> row for O(1) lookups.
+    visible_list = None
+    node_index = {}
+
+    header = [
+        "Use ↑/↓ or j/k to navigate, ←/h to collapse, →/l to expand,",
+        "SPACE to toggle, ENTER to finish, q to quit."
+    ]
+
+    # All visible rows live on one pad; per-frame we just blit the on-screen
+    # window out of it and repaint the handful of rows that changed. ncurses
+    # diffs the virtual screen itself, so unchanged cells never reach the
+    # terminal.
+    pad = None
+    last_size = None
+    prev_cursor = 0
+    height = width = 0
+
+    def draw_row(i):
+        node, depth = visible_list[i]
+        if node._display is None:
+            node._display = compute_display(node)
+        indent = _INDENTS[depth] if depth < len(_INDENTS) else "    " * depth
+        if node.selected:
+            colour = curses.color_pair(1)
+        elif isinstance(node, Dir) and node.partial:
+            colour = curses.color_pair(3)
+        else:
+            colour = curses.color_pair(2)
+        if i == current_index:
+            colour |= curses.A_REVERSE
+        pad.move(i, 0)
+        pad.clrtoeol()
+        pad.addnstr(i, 0, indent + node._display, width - 1, colour)
+
     while True:
-        stdscr.clear()
         height, width = stdscr.getmaxyx()
-
-        header = [
-            "Use ↑/↓ or j/k to navigate, ←/h to collapse, →/l to expand,",
-            "SPACE to toggle, ENTER to finish, q to quit."
-        ]
-        for i, line in enumerate(header):
-            stdscr.addstr(i, 0, line[:width-1])
-
-
-        visible_list = get_visible_nodes(root, -1)[1:]  # Skip the root node
-
-        for i in range(window_pos, min(len(visible_list), window_pos + height - len(header))):
-            node, depth = visible_list[i]
-
-            display_name = node.name
-            if isinstance(node, Dir):
-                if node.expanded:  display_name = "📂 " + display_name
-                else:              display_name = "📁 " + display_name
-            else:
-                ext = node.name.split(".")[-1]
-                icon = {
-                    "py": "🐍 ",
-                    "rs": "🦀 ",
-                    "md": "📝 ",
-                    "txt": "📝 ",
-                    "sh": "🐚 ",
-                    "java": "☕️ "
-                }.get(ext, "📄 ")
-                display_name = icon + display_name
-
-            display_name = ("    " * depth) + display_name
-
-            colour = curses.color_pair(1) if node.selected else curses.color_pair(2)
-            if i == current_index:
-                stdscr.addstr(i - window_pos + len(header), 0, display_name[:width-1], colour | curses.A_REVERSE)
-            else:
-                stdscr.addstr(i - window_pos + len(header), 0, display_name[:width-1], colour)
-
-
-        stdscr.refresh()
+        if (height, width) != last_size:
+            last_size = (height, width)
+            stdscr.erase()
+            for i, line in enumerate(header):
+                stdscr.addstr(i, 0, line[:width-1])
+            pad = None
+
+        if visible_list is None:
+            visible_list = get_visible_nodes(root, -1)[1:]  # Skip the root node
+            node_index = {id(n): i for i, (n, _) in enumerate(visible_list)}
+            current_index = min(current_index, max(0, len(visible_list) - 1))
+            pad = None
+
+        if pad is None:
+            # tall enough to blank out whatever a shorter list leaves behind
+            pad = curses.newpad(max(len(visible_list), height) + 1, width)
+            for i in range(len(visible_list)):
+                draw_row(i)
+        elif prev_cursor != current_index:
+            for i in (prev_cursor, current_index):
+                if i < len(visible_list):
+                    draw_row(i)
+        prev_cursor = current_index
+
+        # keep the scroll offset inside the pad whenever the list or the
+        # terminal shrinks - an out-of-range offset makes noutrefresh throw
+        window_pos = max(0, min(window_pos, len(visible_list) - (height - len(header))))
+
+        stdscr.noutrefresh()
+        pad.noutrefresh(window_pos, 0, len(header), 0, height - 1, width - 1)
+        curses.doupdate()
 
         key = stdscr.getch()
-        if key in (curses.KEY_UP, ord('k')):
-            if current_index > 0:
-                current_index -= 1
-                window_pos = max(0, min(window_pos, current_index - 3))
-
-        elif key in (curses.KEY_DOWN, ord('j')):
-            if current_index < len(visible_list) - 1:
-                current_index += 1
+        if key in (curses.KEY_UP, ord('k'), curses.KEY_DOWN, ord('j')):
+            # Coalesce queued-up autorepeat: drain any further navigation keys
+            # into a single cursor delta so holding j/k costs one redraw per
+            # burst rather than one per keypress.
+            delta = 1 if key in (curses.KEY_DOWN, ord('j')) else -1
+            stdscr.nodelay(True)
+            while (extra := stdscr.getch()) != -1:
+                if extra in (curses.KEY_DOWN, ord('j')):
+                    delta += 1
+                elif extra in (curses.KEY_UP, ord('k')):
+                    delta -= 1
+                else:
+                    curses.ungetch(extra) # not navigation - handle next frame
+                    break
+            stdscr.nodelay(False)
+
+            current_index = max(0, min(len(visible_list) - 1, current_index + delta))
+            if delta > 0:
                 window_pos = max(0, max(window_pos, current_index - height + 5))
+            elif delta < 0:
+                window_pos = max(0, min(window_pos, current_index - 3))
 
         elif key in (curses.KEY_LEFT, ord('h')):
             node, _ = visible_list[current_index]
             if isinstance(node, Dir) and node.expanded:
                 node.expanded = False
+                node._display = None # folder icon changed
+                visible_list = None
             elif node.parent and node.parent.parent:
                 node.parent.expanded = False
-                current_index = 0
-                for i, (n, _) in enumerate(visible_list):
-                    if n == node.parent:
-                        current_index = i
-                        break
+                node.parent._display = None
+                current_index = node_index.get(id(node.parent), 0)
+                visible_list = None
 
         elif key in (curses.KEY_RIGHT, ord('l')):
             node, _ = visible_list[current_index]
             if isinstance(node, Dir) and not node.expanded:
                 node.expanded = True
+                node._display = None # folder icon changed
+                visible_list = None
 
         elif key == ord(' '):
             node, _ = visible_list[current_index]
             invert(node)
+            # a toggle recolours ancestors and any visible subtree - repaint
+            pad = None
 
         elif key == ord('q'):
             sys.exit(0)
@@ -174,13 +516,17 @@ def interactive_selector(stdscr, root) -> Set[str]:
 
 
     def collect_selected(node: Node) -> list[str]:
-
-        if isinstance(node, Dir):
-            subpaths = [collect_selected(child) for child in node.children]
-            return [path for subpath in subpaths for path in subpath]
-
-        else:
-            return [node.path] if node.selected else []
+        selected = []
+        stack = [node]
+        while stack:
+            n = stack.pop()
+            if isinstance(n, Dir):
+                # never-scanned directories can't have had anything toggled
+                if n.children is not None:
+                    stack.extend(n.children)
+            elif n.selected:
+                selected.append(n.path)
+        return selected
 
     return set(collect_selected(root))
 
@@ -192,6 +538,7 @@ parser = argparse.ArgumentParser(
 parser.add_argument("--edit", action="store_true", help="Edit .llm_info file")
 parser.add_argument("--notag", action="store_true", help="Don't wrap output in <project> tag")
 parser.add_argument("--nostructure", action="store_true", help="Don't include a project structure tree in the output")
+parser.add_argument("--no-cache", action="store_true", help="Rebuild the file tree instead of using the cached one")
 args = parser.parse_args()
 
 llm_info_path = ".llm_info"
@@ -200,23 +547,35 @@ directory = os.getcwd()
 # First, read the .llm_info file
 if os.path.exists(llm_info_path):
     try:
-        with open(llm_info_path, "r", encoding="utf-8") as f:
-            selected_files = set(line.strip() for line in f if line.strip())
+        # one binary read + splitlines skips the text-mode IO machinery
+        with open(llm_info_path, "rb") as f:
+            selected_files = set(
+                line.decode("utf-8").strip()
+                for line in f.read().splitlines()
+                if line.strip()
+            )
     except Exception as e:
         print(f"Error reading {llm_info_path}: {e}")
         sys.exit(1)
 
+selected_sorted = sorted(selected_files)
+
 # If .llm_info does not exist, or is empty, or --edit is specified - run interactive selection.
 if len(selected_files) == 0 or args.edit:
 
-    root = Dir(os.path.basename(directory), "", None)
+    root = None if args.no_cache else load_cached_tree()
+    if root is None:
+        tracked = get_git_files()
+        root = tree_from_git(tracked) if tracked else Dir(os.path.basename(directory), "", None)
+        save_cached_tree(root)
     root.expanded = True
 
     selected_files = curses.wrapper(lambda stdscr: interactive_selector(stdscr, root))
+    selected_sorted = sorted(selected_files)
     # Save the selected file paths.
     try:
         with open(llm_info_path, "w", encoding="utf-8") as f:
-            for path in sorted(selected_files):
+            for path in selected_sorted:
                 f.write(path + "\n")
     except Exception as e:
         print(f"Error writing {llm_info_path}: {e}")
@@ -224,9 +583,6 @@ if len(selected_files) == 0 or args.edit:
 
 # ---------------------------- git project structure ---------------------------
 
-
-import subprocess
-
 def build_tree(file_list):
     tree = {}
     for filepath in file_list:
@@ -281,17 +637,8 @@ def render_tree_with_budget(node, prefix="", budget=150, depth=0):
 
 def get_project_structure():
     try:
-        git_check = subprocess.run(
-            ["git", "rev-parse", "--is-inside-work-tree"],
-            capture_output=True, text=True, check=True
-        )
-        if git_check.stdout.strip() == "true":
-            git_files = subprocess.run(
-                ["git", "ls-files"],
-                capture_output=True, text=True, check=True
-            )
-            file_list = git_files.stdout.splitlines()
-        else:
+        file_list = get_git_files()
+        if file_list is None:
             file_list = [
                 str(item)[len(directory) + 1:]
                 for item in Path(directory).rglob("*")
@@ -372,6 +719,7 @@ _LANGUAGE_MAP: Dict[str, str] = {
     "zsh": "bash",
 }
 
+@functools.lru_cache(maxsize=1024)
 def get_language_hint(filename: str) -> str:
     """Return a language hint for syntax highlighting based on the filename.
 
@@ -390,65 +738,213 @@ def get_language_hint(filename: str) -> str:
         Language identifier string compatible with common syntax highlighters,
         or empty string if no appropriate mapping exists.
     """
+    # A hand-rolled basename/splitext: this runs once per selected file, and
+    # rfind on the original string avoids lowercasing the whole path and the
+    # extra allocations of os.path.basename + os.path.splitext.
+    slash = filename.rfind('/')
+    if os.sep != '/':
+        slash = max(slash, filename.rfind(os.sep))
+    basename = filename[slash + 1:].lower()
+
     # Check special filenames first
-    basename = os.path.basename(filename.lower())
     if basename in _SPECIAL_FILENAMES:
         return _SPECIAL_FILENAMES[basename]
 
-    # Handle standard extensions
-    _, ext = os.path.splitext(filename.lower())
-    extension = ext.lstrip('.')
+    # Handle standard extensions - a leading dot (".bashrc") is not one
+    dot = basename.rfind('.')
+    extension = basename[dot + 1:] if dot > 0 else ''
     return _LANGUAGE_MAP.get(extension, extension)
 
-output_lines = []
-if not args.notag:
-    output_lines.append("<project>")
-if project_structure and not args.nostructure:
-    output_lines.append("Project structure:")
-    output_lines.append("```")
-    output_lines.append(project_structure)
-    output_lines.append("```")
-    output_lines.append("")  # blank line
-
-output_lines.append("Relevant files:")
-for path in sorted(selected_files):
-    full_path = os.path.join(directory, path)
-    try:
-        with open(full_path, "r", encoding="utf-8") as f:
-            content = f.read()
-            content = content.replace("\r\n", "\n")
-            content = ('\n' + content).replace("\n```", "\n\\`\\`\\`").strip()
-    except Exception as e:
-        content = f"[Error reading file: {e}]"
-
-    # Get language hint based on file extension
-    lang_hint = get_language_hint(path)
-
-    output_lines.append(f"\n{path}")
-    output_lines.append(f"```{lang_hint}\n{content}\n```")
-    output_lines.append("")
-
-if not args.notag:
-    output_lines.append("</project>")
-
-output_text = "\n".join(output_lines)
-
-print(output_text)
+def start_clipboard_writer():
+    """Spawn the clipboard helper and a thread feeding it from a queue.
 
-# output to clipboard
-try:
+    Output chunks stream into the pipe as they're produced, so peak memory
+    stays bounded by the queue instead of holding a second full copy of the
+    output, and the copy overlaps with printing.
+    """
     system = platform.system()
     if system == "Darwin":
-        subprocess.run("pbcopy", universal_newlines=True, input=output_text)
+        cmd, shell = "pbcopy", False
     elif system == "Linux":
-        subprocess.run("xclip -selection clipboard", shell=True, universal_newlines=True, input=output_text)
+        cmd, shell = "xclip -selection clipboard", True
     elif system == "Windows":
-        subprocess.run("clip", universal_newlines=True, input=output_text)
+        cmd, shell = "clip", False
     else:
         raise NotImplementedError(f"Unsupported OS: {system}")
 
-    print("Offering to inscrutable machine-gods copied to clipboard 🌌")
+    proc = subprocess.Popen(cmd, shell=shell, stdin=subprocess.PIPE)
+    chunks = queue.Queue(maxsize=64)
+
+    def feed():
+        broken = False
+        while True:
+            chunk = chunks.get()
+            if chunk is None:
+                break
+            if not broken:
+                try:
+                    proc.stdin.write(chunk)
+                except Exception:
+                    broken = True # helper went away; keep draining the queue
+        try:
+            proc.stdin.close()
+            proc.wait()
+        except Exception:
+            pass
+
+    # Deliberately not a daemon thread - the interpreter won't exit until the
+    # clipboard actually has the data, it just doesn't hold up the output.
+    threading.Thread(target=feed).start()
+    return chunks
 
+try:
+    clip_chunks = start_clipboard_writer()
+    clip_error = None
 except Exception as e:
-    print(f"Failed to copy to clipboard: {e}")
+    clip_chunks = None
+    clip_error = e
+
+# Each chunk carries its own newlines and is written straight to both stdout
+# and the clipboard pipe as it's produced - no giant concatenation, and
+# output starts appearing before the last file is even read.
+stdout_open = True
+
+def emit(chunk: bytes) -> None:
+    global stdout_open
+    if stdout_open:
+        try:
+            sys.stdout.buffer.write(chunk)
+        except BrokenPipeError:
+            # whoever was reading stdout went away (`synopsis | head` etc) -
+            # keep going so the clipboard still gets the full output
+            stdout_open = False
+    if clip_chunks is not None:
+        clip_chunks.put(chunk)
+
+# Anything bigger than this gets a placeholder instead of being pasted
+# wholesale - a stray log or binary asset shouldn't blow up the clipboard.
+MAX_FILE_BYTES = int(os.environ.get("SYNOPSIS_MAX_BYTES", 1024 * 1024))
+
+def prepare_content(data: bytes) -> bytes:
+    # File contents stay as bytes the whole way through - they get read as
+    # bytes and written to stdout/the clipboard pipe as bytes, so a decode +
+    # re-encode round trip would buy nothing.
+    # NUL bytes near the start are a solid tell that this isn't text.
+    if b"\x00" in data[:1024]:
+        return b"[Skipped: binary file]"
+    data = data.replace(b"\r\n", b"\n")
+    # Only pay for an escaped copy when there's actually a fence to escape -
+    # the `in` check is a fast C-level scan and almost always says no.
+    if b"```" in data:
+        data = data.replace(b"```", b"\\`\\`\\`")
+    return data.strip()
+
+def read_one(path: str) -> bytes:
+    full_path = os.path.join(directory, path)
+    try:
+        size = os.stat(full_path).st_size
+        if size > MAX_FILE_BYTES:
+            return f"[Skipped: {size} bytes, over the {MAX_FILE_BYTES} byte limit]".encode()
+        with open(full_path, "rb") as f:
+            content = prepare_content(f.read())
+    except Exception as e:
+        content = f"[Error reading file: {e}]".encode()
+    return content
+
+def read_all_uring(paths: list) -> list:
+    # Queue a batch of reads on an io_uring, submit them with one syscall, and
+    # collect the completions. 64 entries per ring keeps the batches at the
+    # sweet spot between submission cost and queue depth.
+    contents = []
+    for start in range(0, len(paths), 64):
+        batch = paths[start:start + 64]
+        ring = liburing.io_uring()
+        liburing.io_uring_queue_init(len(batch), ring, 0)
+        fds = []
+        bufs = [None] * len(batch)
+        results = [None] * len(batch)
+        try:
+            submitted = 0
+            for i, path in enumerate(batch):
+                fd = os.open(os.path.join(directory, path), os.O_RDONLY)
+                fds.append(fd)
+                size = os.fstat(fd).st_size
+                if size > MAX_FILE_BYTES:
+                    results[i] = f"[Skipped: {size} bytes, over the {MAX_FILE_BYTES} byte limit]".encode()
+                    continue
+                bufs[i] = bytearray(size)
+                sqe = liburing.io_uring_get_sqe(ring)
+                liburing.io_uring_prep_read(sqe, fd, bufs[i], size, 0)
+                sqe.user_data = i
+                submitted += 1
+            if submitted:
+                liburing.io_uring_submit(ring)
+
+            cqe = liburing.io_uring_cqe()
+            for _ in range(submitted):
+                liburing.io_uring_wait_cqe(ring, cqe)
+                i = cqe.user_data
+                try:
+                    n = liburing.trap_error(cqe.res)
+                    results[i] = prepare_content(bytes(bufs[i][:n]))
+                except Exception as e:
+                    results[i] = f"[Error reading file: {e}]".encode()
+                liburing.io_uring_cqe_seen(ring, cqe)
+        finally:
+            for fd in fds:
+                os.close(fd)
+            liburing.io_uring_queue_exit(ring)
+        contents.extend(results)
+    return contents
+
+def read_all(paths: list) -> list:
+    if _HAS_LIBURING:
+        try:
+            return read_all_uring(paths)
+        except Exception:
+            pass # missing file, old kernel, api mismatch - take the slow path
+
+    # Otherwise read on a thread pool - the GIL is released during file I/O,
+    # so the per-file open/read latency overlaps instead of serializing.
+    with ThreadPoolExecutor(max_workers=min(32, len(paths))) as executor:
+        return list(executor.map(read_one, paths))
+
+# The feeder is a non-daemon thread blocked on the queue, so the sentinel has
+# to go in no matter how emission ends - a Ctrl-C or stray exception before
+# it would otherwise leave the process stuck in thread shutdown forever.
+try:
+    if not args.notag:
+        emit(b"<project>\n")
+    if project_structure and not args.nostructure:
+        emit(f"Project structure:\n```\n{project_structure}\n```\n\n".encode("utf-8"))
+
+    contents = read_all(selected_sorted) if selected_sorted else []
+
+    emit(b"Relevant files:\n")
+    for path, content in zip(selected_sorted, contents):
+        # Get language hint based on file extension
+        lang_hint = get_language_hint(path)
+        emit(f"\n{path}\n```{lang_hint}\n".encode("utf-8") + content + b"\n```\n\n")
+
+    if not args.notag:
+        emit(b"</project>")
+
+    # close out stdout (the trailing newline isn't part of the clipboard copy)
+    try:
+        if stdout_open:
+            sys.stdout.buffer.write(b"\n")
+    except BrokenPipeError:
+        stdout_open = False
+finally:
+    if clip_chunks is not None:
+        clip_chunks.put(None)
+
+try:
+    sys.stdout.buffer.flush()
+    if clip_chunks is not None:
+        print("Offering to inscrutable machine-gods copied to clipboard 🌌")
+    else:
+        print(f"Failed to copy to clipboard: {clip_error}")
+except BrokenPipeError:
+    pass
 